@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import functools
+import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, List, Tuple
 
-from dateutil import parser
+import numpy as np
 import swisseph as swe
 
-from .config import ASTRO_CONFIG
+from .config import ASTRO_CONFIG, CONFIG_HASH
 
 # ----------------------
 # Constants / mappings
@@ -46,22 +49,73 @@ PLANET_IDS = {
     # Nodes handled separately
 }
 
+# Bodies computed per snapshot, in output order. Mean node (Rahu) last;
+# Ketu is derived from it and never hits swisseph.
+BODY_NAMES = tuple(PLANET_IDS) + ("Rahu",)
+BODY_IDS = tuple(PLANET_IDS.values()) + (swe.MEAN_NODE,)
+
 # ----------------------
 # Swiss Ephemeris setup
 # ----------------------
 
+_EPHE_PATH = os.getenv("SE_EPHE_PATH", "/opt/ephe")
+_swe_thread = threading.local()
+
+
 def _init_swe() -> None:
-    # Sidereal Lahiri
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    """Initialize swisseph for the current thread (idempotent).
+
+    pyswisseph keeps its settings (sidereal mode, ephemeris path) in
+    thread-local storage, and FastAPI runs sync endpoints on a thread
+    pool, so init done at import only covers the importing thread.
+    Every entry point that calls into libswe must go through this first
+    or it would silently compute with the default (Fagan-Bradley)
+    ayanamsa.
+    """
+    if getattr(_swe_thread, "ready", False):
+        return
+    swe.set_ephe_path(_EPHE_PATH)
+    swe.set_sid_mode(swe.SIDM_LAHIRI)  # Sidereal Lahiri
+    _swe_thread.ready = True
 
 _init_swe()
 
 FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
 
 
+def _ephemeris_arrays(jd_ut: float,
+                      _calc=swe.calc_ut, _flags=FLAGS,
+                      _ids=BODY_IDS) -> Tuple[List[float], List[float]]:
+    """Sidereal longitudes and speeds for all bodies at a Julian day.
+
+    The engine is pinned to one configuration (sidereal/Lahiri/mean
+    node), so the libswe callable, flags and body tuple are baked in as
+    argument defaults: resolved once when the function is created, not
+    looked up per call. xx = [lon, lat, dist, lon_speed, ...]; the
+    comprehensions keep loop scaffolding in C.
+    """
+    coords = [_calc(jd_ut, pid, _flags)[0] for pid in _ids]
+    return [xx[0] % 360.0 for xx in coords], [xx[3] for xx in coords]
+
+
+def _warm_ephemeris() -> None:
+    # Touch every body once so ephemeris file I/O and libswe's internal
+    # caches are populated at startup rather than on the first request.
+    for pid in BODY_IDS:
+        swe.calc_ut(2451545.0, pid, FLAGS)
+
+_warm_ephemeris()
+
+
 def parse_ts(ts_iso: str) -> datetime:
     """Parse an ISO timestamp (with offset) to aware datetime."""
-    dt = parser.isoparse(ts_iso)
+    try:
+        # C-implemented; handles +05:30-style offsets natively on 3.11+
+        dt = datetime.fromisoformat(ts_iso)
+    except ValueError:
+        # dateutil is slower but accepts non-standard inputs
+        from dateutil import parser
+        dt = parser.isoparse(ts_iso)
     if dt.tzinfo is None:
         # Assume UTC if missing; UI always provides +05:30
         dt = dt.replace(tzinfo=timezone.utc)
@@ -71,153 +125,198 @@ def parse_ts(ts_iso: str) -> datetime:
 def to_jd_ut(dt: datetime) -> float:
     """Convert aware datetime to Julian day (UT)."""
     dt_utc = dt.astimezone(timezone.utc)
-    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day,
-                      dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0)
+    return _jd_ut_cached(dt_utc.year, dt_utc.month, dt_utc.day,
+                         dt_utc.hour, dt_utc.minute, dt_utc.second)
+
+
+@functools.lru_cache(maxsize=1024)
+def _jd_ut_cached(year: int, month: int, day: int,
+                  hour: int, minute: int, second: int) -> float:
+    return swe.julday(year, month, day,
+                      hour + minute / 60.0 + second / 3600.0)
+
+
+@functools.lru_cache(maxsize=4096)
+def ayanamsa_ut(jd_ut: float) -> float:
+    """Lahiri ayanamsa for a Julian day (UT); cached for repeat/batch traffic."""
+    _init_swe()
+    return swe.get_ayanamsa_ut(jd_ut)
 
 
 def norm360(x: float) -> float:
-    x = x % 360.0
-    return x + 360.0 if x < 0 else x
+    # Double mod instead of a sign branch: Python's % already yields a
+    # result in [0, 360) for finite x, so the second mod only cleans up
+    # a 360.0 produced by rounding at the boundary. No data-dependent
+    # branch for mixed-sign inputs.
+    return (x % 360.0 + 360.0) % 360.0
 
 
 def angular_sep(a: float, b: float) -> float:
     """Minimum separation between two angles in degrees (0..180)."""
-    d = abs(norm360(a) - norm360(b))
+    # abs-diff mod 360 is normalization-independent; no norm360 calls needed
+    d = abs(a - b) % 360.0
     return 360.0 - d if d > 180.0 else d
 
 
 def sign_from_lon(lon: float) -> Tuple[str, float]:
-    lon = norm360(lon)
+    lon %= 360.0  # Python % with positive divisor is already in [0, 360)
     sign_idx = int(lon // 30.0)
     deg_in_sign = lon - sign_idx * 30.0
     return SIGN_NAMES[sign_idx], deg_in_sign
 
 
+_NAK_SIZE = 360.0 / 27.0  # 13.333...
+_PADA_SIZE = _NAK_SIZE / 4.0  # each nak is 4 padas
+_NAK_INDEX = {name: i for i, name in enumerate(NAKSHATRA_NAMES)}
+
+
 def nakshatra_from_lon(lon: float) -> Tuple[str, int]:
-    lon = norm360(lon)
-    nak_size = 360.0 / 27.0  # 13.333...
-    idx = int(lon // nak_size)
-    name = NAKSHATRA_NAMES[idx]
-    # Pada: each nak is 4 padas
-    pada_size = nak_size / 4.0
-    pos_in_nak = lon - idx * nak_size
-    pada = int(pos_in_nak // pada_size) + 1
-    return name, pada
+    lon %= 360.0
+    idx = int(lon // _NAK_SIZE)
+    pada = int((lon - idx * _NAK_SIZE) // _PADA_SIZE) + 1
+    return NAKSHATRA_NAMES[idx], pada
 
 
-def navamsha_sign(sign_name: str, deg_in_sign: float) -> str:
-    """Compute D9 sign (Navamsa) from D1 sign and degree-in-sign.
+def _classify(lon: float) -> Tuple[int, float, int, int]:
+    """Sign index, degree-in-sign, nakshatra index and pada for a longitude.
 
-    Rule:
-      - Movable signs (Aries, Cancer, Libra, Capricorn): start from same sign
-      - Fixed signs (Taurus, Leo, Scorpio, Aquarius): start from 9th from sign
-      - Dual signs (Gemini, Virgo, Sagittarius, Pisces): start from 5th from sign
+    One-pass replacement for sign_from_lon + nakshatra_from_lon on the
+    snapshot hot path: the longitude is normalized once and everything
+    downstream works on indices, not names.
     """
-    sign_idx = SIGN_NAMES.index(sign_name)
-    movable = {0, 3, 6, 9}
-    fixed = {1, 4, 7, 10}
-    dual = {2, 5, 8, 11}
-    if sign_idx in movable:
-        start = sign_idx
-    elif sign_idx in fixed:
-        start = (sign_idx + 8) % 12
-    else:  # dual
-        start = (sign_idx + 4) % 12
-
-    segment = int(deg_in_sign // (30.0 / 9.0))  # 0..8, each 3.333...
-    d9_idx = (start + segment) % 12
-    return SIGN_NAMES[d9_idx]
-
-
-def planet_lon_speed(jd_ut: float, planet_id: int) -> Tuple[float, float]:
-    """Return sidereal longitude and speed (deg/day)."""
-    # swe.calc_ut returns (xx, retflag). xx = [lon, lat, dist, lon_speed, lat_speed, dist_speed]
-    xx, _ = swe.calc_ut(jd_ut, planet_id, FLAGS)
-    lon = norm360(xx[0])
-    speed = xx[3]
-    return lon, speed
-
-
-def mean_node_lon_speed(jd_ut: float) -> Tuple[float, float]:
-    """Mean node (Rahu) longitude/speed; Ketu is opposite."""
-    xx, _ = swe.calc_ut(jd_ut, swe.MEAN_NODE, FLAGS)
-    lon = norm360(xx[0])
-    speed = xx[3]
-    return lon, speed
+    lon %= 360.0
+    sign_idx = int(lon // 30.0)
+    deg_in_sign = lon - sign_idx * 30.0
+    nak_idx = int(lon // _NAK_SIZE)
+    pada = int((lon - nak_idx * _NAK_SIZE) // _PADA_SIZE) + 1
+    return sign_idx, deg_in_sign, nak_idx, pada
+
+
+# Navamsha (D9) lookup table, built once at import.
+# Rule:
+#   - Movable signs (Aries, Cancer, Libra, Capricorn): start from same sign
+#   - Fixed signs (Taurus, Leo, Scorpio, Aquarius): start from 9th from sign
+#   - Dual signs (Gemini, Virgo, Sagittarius, Pisces): start from 5th from sign
+_SIGN_INDEX = {name: i for i, name in enumerate(SIGN_NAMES)}
+_NAV_STARTS = [
+    i if i % 3 == 0 else (i + 8) % 12 if i % 3 == 1 else (i + 4) % 12
+    for i in range(12)
+]
+_NAVAMSHA_TABLE = [
+    [SIGN_NAMES[(start + seg) % 12] for seg in range(9)] for start in _NAV_STARTS
+]
+
+
+def navamsha_sign(sign_name: str, deg_in_sign: float) -> str:
+    """Compute D9 sign (Navamsa) from D1 sign and degree-in-sign."""
+    # Each navamsha segment spans 30/9 deg, so segment = deg * 9/30 = deg * 0.3
+    return _NAVAMSHA_TABLE[_SIGN_INDEX[sign_name]][int(deg_in_sign * 0.3)]
+
+
+# Output row keys, hoisted so each body dict is built in one zip pass
+_D1_KEYS = ("name", "lon_sid_deg", "sign", "deg_in_sign", "nakshatra", "pada",
+            "speed_deg_day", "is_retro", "is_stationary")
+_D9_KEYS = ("name", "sign_d9", "vargottam")
+
+
+def _body_rows(name: str, lon: float, speed: float,
+               sign_idx: int, deg_in_sign: float, nak_idx: int, pada: int,
+               stationary_thr: float) -> Tuple[Dict[str, object], Dict[str, object]]:
+    """Build the D1 and D9 output rows for one pre-classified body."""
+    # Raw floats throughout; orjson's dtoa at the response boundary is
+    # cheaper than per-field round() calls here.
+    sign = SIGN_NAMES[sign_idx]
+    d1_row = dict(zip(_D1_KEYS, (
+        name, lon, sign, deg_in_sign, NAKSHATRA_NAMES[nak_idx], pada,
+        speed, speed < 0, abs(speed) < stationary_thr,
+    )))
+    d9_sign = _NAVAMSHA_TABLE[sign_idx][int(deg_in_sign * 0.3)]
+    d9_row = dict(zip(_D9_KEYS, (name, d9_sign, d9_sign == sign)))
+    return d1_row, d9_row
 
 
 def tithi(sun_lon: float, moon_lon: float) -> Dict[str, object]:
-    diff = norm360(moon_lon - sun_lon)
+    diff = (moon_lon - sun_lon) % 360.0
     idx = int(diff // 12.0) + 1  # 1..30
     name = TITHI_NAMES[idx - 1]
     paksha = "Shukla" if idx <= 15 else "Krishna"
     return {"tithi_index": idx, "tithi_name": name, "paksha": paksha}
 
 
+# The config-derived part of the meta block never changes within a
+# process; build it once and splat it into each snapshot's meta.
+_META_STATIC = {
+    "tz": ASTRO_CONFIG["location"]["tz"],
+    "location": ASTRO_CONFIG["location"],
+    "system": {
+        "zodiac": ASTRO_CONFIG["zodiac_system"],
+        "ayanamsa": ASTRO_CONFIG["ayanamsa"],
+        "node": ASTRO_CONFIG["node_type"],
+    },
+    "config_hash": CONFIG_HASH,
+}
+_STATIONARY_THR = ASTRO_CONFIG["defaults"]["stationary_speed_threshold_deg_per_day"]
+
+
 def compute_snapshot(ts_iso: str) -> Dict[str, object]:
+    """Compute (or fetch from cache) a snapshot for a timestamp.
+
+    The timestamp is canonicalized to a UTC ISO string truncated to
+    seconds so that equivalent inputs (offset spellings, sub-second
+    noise) hit the same cache entry, while meta.ts still echoes the
+    caller's own offset. Returns a shallow copy so callers may attach
+    extra keys without poisoning the cache.
+    """
+    dt = parse_ts(ts_iso)
+    ts_canon = dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+    out = dict(_compute_snapshot_cached(ts_canon))
+    out["meta"] = {**out["meta"], "ts": dt.isoformat()}
+    return out
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_snapshot_cached(ts_iso: str) -> Dict[str, object]:
+    _init_swe()  # sid mode is thread-local; see docstring
     dt = parse_ts(ts_iso)
     jd = to_jd_ut(dt)
 
-    stationary_thr = ASTRO_CONFIG["defaults"]["stationary_speed_threshold_deg_per_day"]
+    stationary_thr = _STATIONARY_THR
+
+    lons, spds = _ephemeris_arrays(jd)
+
+    sun_lon = lons[0]
+    moon_lon = lons[1]
 
     # Compute planets
     d1 = []
     d9 = []
 
-    # Sun/Moon first for Panchang
-    sun_lon, sun_spd = planet_lon_speed(jd, swe.SUN)
-    moon_lon, moon_spd = planet_lon_speed(jd, swe.MOON)
-
-    # Helper to add a body
-    def add_body(name: str, lon: float, speed: float):
-        sign, deg_in_sign = sign_from_lon(lon)
-        nak, pada = nakshatra_from_lon(lon)
-        is_retro = speed < 0
-        is_stationary = abs(speed) < stationary_thr
-        d1.append({
-            "name": name,
-            "lon_sid_deg": lon,
-            "sign": sign,
-            "deg_in_sign": round(deg_in_sign, 6),
-            "nakshatra": nak,
-            "pada": pada,
-            "speed_deg_day": round(speed, 6),
-            "is_retro": bool(is_retro),
-            "is_stationary": bool(is_stationary),
-        })
-        d9_sign = navamsha_sign(sign, deg_in_sign)
-        d9.append({
-            "name": name,
-            "sign_d9": d9_sign,
-            "vargottam": (d9_sign == sign),
-        })
-
-    # Standard planets
-    for pname, pid in PLANET_IDS.items():
-        lon, spd = planet_lon_speed(jd, pid)
-        add_body(pname, lon, spd)
-
-    # Mean node Rahu / Ketu
-    rahu_lon, rahu_spd = mean_node_lon_speed(jd)
-    ketu_lon = norm360(rahu_lon + 180.0)
-    ketu_spd = rahu_spd  # opposite node, same magnitude/signed speed model
-    add_body("Rahu", rahu_lon, rahu_spd)
-    add_body("Ketu", ketu_lon, ketu_spd)
+    # Standard planets + mean node Rahu
+    for name, lon, spd in zip(BODY_NAMES, lons, spds):
+        sign_idx, deg_in_sign, nak_idx, pada = _classify(lon)
+        d1_row, d9_row = _body_rows(name, lon, spd, sign_idx, deg_in_sign,
+                                    nak_idx, pada, stationary_thr)
+        d1.append(d1_row)
+        d9.append(d9_row)
+
+    # Ketu: opposite node, same magnitude/signed speed model. +180 deg is
+    # exactly 6 signs and 54 whole padas, so its fields follow from Rahu's
+    # (last loop iteration) without re-running the classification chain.
+    ketu_pada_global = (nak_idx * 4 + pada - 1 + 54) % 108
+    d1_row, d9_row = _body_rows(
+        "Ketu", (lons[-1] + 180.0) % 360.0, spds[-1],
+        (sign_idx + 6) % 12, deg_in_sign,
+        ketu_pada_global // 4, ketu_pada_global % 4 + 1,
+        stationary_thr,
+    )
+    d1.append(d1_row)
+    d9.append(d9_row)
 
     # Panchang
     panchang = tithi(sun_lon, moon_lon)
 
     return {
-        "meta": {
-            "ts": dt.isoformat(),
-            "tz": ASTRO_CONFIG["location"]["tz"],
-            "location": ASTRO_CONFIG["location"],
-            "system": {
-                "zodiac": ASTRO_CONFIG["zodiac_system"],
-                "ayanamsa": ASTRO_CONFIG["ayanamsa"],
-                "node": ASTRO_CONFIG["node_type"],
-            },
-        },
+        "meta": {"ts": dt.isoformat(), **_META_STATIC},
         "d1": {"planets": d1},
         "d9": {"planets": d9},
         "panchang": panchang,
@@ -225,36 +324,56 @@ def compute_snapshot(ts_iso: str) -> Dict[str, object]:
 
 
 def compute_aspects(planets: List[Dict[str, object]], orb_deg: float = 3.0) -> List[Dict[str, object]]:
-    """Compute basic aspects among planets in given snapshot. Optional."""
-    # aspects: conj, opp, trine, square, sextile
-    aspects = []
-    aspect_defs = [
-        ("CONJUNCTION", 0.0),
-        ("SEXTILE", 60.0),
-        ("SQUARE", 90.0),
-        ("TRINE", 120.0),
-        ("OPPOSITION", 180.0),
-    ]
-
-    names = [p["name"] for p in planets]
-    lon_map = {p["name"]: float(p["lon_sid_deg"]) for p in planets}
-
-    for i in range(len(names)):
-        for j in range(i + 1, len(names)):
-            a = names[i]
-            b = names[j]
-            sep = angular_sep(lon_map[a], lon_map[b])
-            for aspect_name, target in aspect_defs:
-                diff = abs(sep - target)
-                if diff <= orb_deg:
-                    aspects.append({
-                        "a": a,
-                        "b": b,
-                        "aspect": aspect_name,
-                        "sep_deg": round(sep, 6),
-                        "orb_deg": round(diff, 6),
-                        "orb_used": orb_deg,
-                    })
-                    break
-
-    return aspects
+    """Compute (or fetch from cache) basic aspects among planets. Optional.
+
+    Adapts the serialized list-of-dicts planet shape to the parallel
+    names/longitudes arrays the kernel works on. Longitudes are rounded
+    to 1e-6 deg for the cache key; that is far below any meaningful orb
+    so it never changes which aspects match.
+    """
+    names = tuple(p["name"] for p in planets)
+    lons = tuple(round(float(p["lon_sid_deg"]), 6) for p in planets)
+    return list(_compute_aspects_cached(names, lons, orb_deg))
+
+
+# aspects: conj, opp, trine, square, sextile (order matters: first match wins)
+_ASPECT_DEFS = (
+    ("CONJUNCTION", 0.0),
+    ("SEXTILE", 60.0),
+    ("SQUARE", 90.0),
+    ("TRINE", 120.0),
+    ("OPPOSITION", 180.0),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_aspects_cached(
+    names: Tuple[str, ...], planet_lons: Tuple[float, ...], orb_deg: float
+) -> Tuple[Dict[str, object], ...]:
+    lons = np.fromiter(planet_lons, dtype=np.float64, count=len(planet_lons))
+
+    # Full pairwise minimum-separation matrix (0..180), one vector op
+    sep = np.abs(lons[:, None] - lons[None, :]) % 360.0
+    sep = np.minimum(sep, 360.0 - sep)
+    upper = np.triu(np.ones(sep.shape, dtype=bool), 1)
+
+    # (i, j) -> (aspect_name, sep, orb); defs order so first match wins
+    hits: Dict[Tuple[int, int], Tuple[str, float, float]] = {}
+    for aspect_name, target in _ASPECT_DEFS:
+        diff = np.abs(sep - target)
+        for i, j in np.argwhere((diff <= orb_deg) & upper):
+            pair = (int(i), int(j))
+            if pair not in hits:
+                hits[pair] = (aspect_name, sep[i, j], diff[i, j])
+
+    return tuple(
+        {
+            "a": names[i],
+            "b": names[j],
+            "aspect": aspect_name,
+            "sep_deg": round(float(pair_sep), 6),
+            "orb_deg": round(float(pair_orb), 6),
+            "orb_used": orb_deg,
+        }
+        for (i, j), (aspect_name, pair_sep, pair_orb) in sorted(hits.items())
+    )
@@ -22,7 +22,15 @@ ASTRO_CONFIG = {
 }
 
 
-def config_hash() -> str:
-    """Stable hash for caching/auditing."""
+def _compute_config_hash() -> str:
     s = json.dumps(ASTRO_CONFIG, sort_keys=True, separators=(",", ":"))
     return hashlib.sha256(s.encode("utf-8")).hexdigest()[:16]
+
+
+# Config is a module-level constant, so hash once per process
+CONFIG_HASH = _compute_config_hash()
+
+
+def config_hash() -> str:
+    """Stable hash for caching/auditing."""
+    return CONFIG_HASH
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Optional
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from .config import ASTRO_CONFIG, config_hash
 from .astro import compute_snapshot, compute_aspects
 
 APP_NAME = os.getenv("APP_NAME", "astro-engine")
 
-app = FastAPI(title=APP_NAME, version="0.1.0")
+app = FastAPI(title=APP_NAME, version="0.1.0", default_response_class=ORJSONResponse)
 
 # CORS: allow your Vercel UI (and local dev). Set CORS_ORIGINS="https://your-ui.vercel.app,https://other" if you want to lock down.
 _origins = os.getenv("CORS_ORIGINS", "*").split(",")
@@ -36,7 +40,6 @@ def snapshot(
     data = compute_snapshot(ts)
     if include_aspects:
         data["aspects"] = compute_aspects(data["d1"]["planets"], orb_deg=orb)
-    data["meta"]["config_hash"] = config_hash()
     return data
 
 
@@ -46,11 +49,79 @@ def health():
     return {"ok": True}
 
 
+# Snapshots are independent per day, so batches parallelize across
+# processes (not threads: libswe holds the GIL for most of its compute).
+# Lazy singleton so single-snapshot traffic never pays the pool spawn;
+# the lock keeps concurrent first requests (sync endpoints run on a
+# thread pool) from racing two executors into existence.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pool_unavailable = False
+_POOL_THRESHOLD = 16  # below this, fork/IPC overhead beats the parallelism
+
+
+def _daily_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool, or None where multiprocessing cannot run.
+
+    On AWS Lambda there is no /dev/shm, so the SemLock allocation inside
+    ProcessPoolExecutor raises OSError; remember the failure and fall
+    back to inline computation for the life of the process.
+    """
+    global _pool, _pool_unavailable
+    if _pool is None and not _pool_unavailable:
+        with _pool_lock:
+            if _pool is None and not _pool_unavailable:
+                try:
+                    _pool = ProcessPoolExecutor(
+                        max_workers=max(1, (os.cpu_count() or 2) // 2)
+                    )
+                except OSError:
+                    _pool_unavailable = True
+    return _pool
+
+
 @app.get("/v1/daily")
-def daily():
+def daily(
+    start: date = Query(..., description="First day (inclusive), e.g. 2026-01-01"),
+    end: date = Query(..., description="Last day (inclusive)"),
+    eval_time: Optional[str] = Query(None, description="HH:MM:SS local (Asia/Kolkata); defaults to config"),
+):
+    """Daily snapshots at the evaluation time for each day in [start, end]."""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    n_days = (end - start).days + 1
+    if n_days > 366:
+        raise HTTPException(status_code=400, detail="range limited to 366 days per request")
+
+    try:
+        # Re-format through the parsed time so lax-but-parseable input
+        # (e.g. 9:15:00) still yields a valid zero-padded timestamp
+        t = datetime.strptime(
+            eval_time or ASTRO_CONFIG["defaults"]["daily_eval_time"], "%H:%M:%S"
+        ).time().isoformat()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="eval_time must be HH:MM:SS")
+
+    # Fixed IST offset (Asia/Kolkata has no DST)
+    timestamps = [
+        f"{(start + timedelta(days=i)).isoformat()}T{t}+05:30" for i in range(n_days)
+    ]
+    pool = _daily_pool() if n_days >= _POOL_THRESHOLD else None
+    if pool is None:
+        snapshots = [compute_snapshot(ts) for ts in timestamps]
+    else:
+        snapshots = list(pool.map(compute_snapshot, timestamps, chunksize=16))
+
     return {
-        "error": "NotImplemented",
-        "message": "Daily batch endpoint will be added in next iteration (requires caching + paging).",
+        "meta": {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "eval_time": t,
+            "tz": ASTRO_CONFIG["location"]["tz"],
+            "days": n_days,
+            "config_hash": config_hash(),
+        },
+        "snapshots": snapshots,
     }
 
 